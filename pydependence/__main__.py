@@ -27,9 +27,6 @@ import argparse
 import logging
 import typing
 
-from pydependence._cli import pydeps
-from pydependence._core.requirements_map import NoConfiguredRequirementMappingError
-
 LOGGER = logging.getLogger(__name__)
 
 # ========================================================================= #
@@ -79,6 +76,11 @@ def _cli():
     # args
     args = _parse_args()
 
+    # delay heavy imports (pydantic, networkx, ...) until after parsing the
+    # arguments, so that `--help` and usage errors return immediately.
+    from pydependence._cli import pydeps
+    from pydependence._core.requirements_map import NoConfiguredRequirementMappingError
+
     # run
     try:
         changed = pydeps(
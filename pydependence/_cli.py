@@ -23,20 +23,22 @@
 # ============================================================================== #
 
 import contextlib
+import functools
 import logging
 import shutil
 import tempfile
 import warnings
-from collections import defaultdict
+from collections import Counter
 from enum import Enum
 from pathlib import Path
-from typing import Dict, List, Literal, Optional, Union
+from typing import TYPE_CHECKING, Dict, List, Literal, Optional, Tuple, Union
 
 import pydantic
 from packaging.requirements import Requirement
 from typing_extensions import Annotated
 
 from pydependence._core.module_imports_ast import ManualImportInfo
+from pydependence._core.module_imports_loader import DEFAULT_MODULE_IMPORTS_LOADER
 from pydependence._core.modules_scope import (
     ModulesScope,
     RestrictMode,
@@ -55,11 +57,14 @@ from pydependence._core.requirements_map import (
 from pydependence._core.requirements_out import OutMappedRequirements
 from pydependence._core.utils import (
     apply_root_to_path_str,
-    load_toml_document,
-    toml_file_replace_array,
+    load_toml_dict,
+    toml_file_replace_arrays,
     txt_file_dump,
 )
 
+if TYPE_CHECKING:
+    import tomlkit.items
+
 # python 3.8 support
 # TODO: this pattern is not yet supported by the lazy dependency resolver
 #       we should specifically add support for this pattern, as it is a common.
@@ -352,6 +357,27 @@ class _Output(_ResolveRules, extra="forbid"):
             exclude_builtins=self.exclude_builtins,
         )
 
+    def resolve_and_generate_requirements(
+        self,
+        loaded_scopes: "LoadedScopes",
+        requirements_mapper: RequirementsMapper,
+    ) -> OutMappedRequirements:
+        # 1. resolve imports
+        resolved_imports = self.get_resolved_imports(loaded_scopes=loaded_scopes)
+        manual_imports = self.get_manual_imports()
+        # 2. generate requirements
+        try:
+            return requirements_mapper.generate_output_requirements(
+                imports=resolved_imports + manual_imports,
+                requirements_env=self.env,
+                strict=self.strict_requirements_map,
+                resolver_name=self.get_output_extras_name(),
+            )
+        except NoConfiguredRequirementMappingError as e:
+            msg = f"\n  | ".join(["", *str(e).split("\n")])
+            msg = f"[requirement-mapping-error] output: {self.get_output_extras_name()}{msg}"
+            raise NoConfiguredRequirementMappingError(msg, e.imports) from e
+
     def resolve_generate_and_write_requirements(
         self,
         loaded_scopes: "LoadedScopes",
@@ -370,22 +396,12 @@ class _Output(_ResolveRules, extra="forbid"):
         Returns:
             bool: True if the file was changed, False if it was not changed.
         """
-        # 1. resolve imports
-        resolved_imports = self.get_resolved_imports(loaded_scopes=loaded_scopes)
-        manual_imports = self.get_manual_imports()
-        # 2. generate requirements
-        try:
-            mapped_requirements = requirements_mapper.generate_output_requirements(
-                imports=resolved_imports + manual_imports,
-                requirements_env=self.env,
-                strict=self.strict_requirements_map,
-                resolver_name=self.get_output_extras_name(),
-            )
-        except NoConfiguredRequirementMappingError as e:
-            msg = f"\n  | ".join(["", *str(e).split("\n")])
-            msg = f"[requirement-mapping-error] output: {self.get_output_extras_name()}{msg}"
-            raise NoConfiguredRequirementMappingError(msg, e.imports) from e
-        # 3. write requirements
+        # 1. resolve imports & generate requirements
+        mapped_requirements = self.resolve_and_generate_requirements(
+            loaded_scopes=loaded_scopes,
+            requirements_mapper=requirements_mapper,
+        )
+        # 2. write requirements
         changed = self._write_requirements(
             mapped_requirements=mapped_requirements,
             dry_run=dry_run,
@@ -437,13 +453,51 @@ class _OutputRequirements(_Output):
         return gen_info.changed
 
 
-class _OutputPyprojectOptionalDeps(_Output):
-    output_mode: Literal[OutputModeEnum.optional_dependencies]
+def _write_pyproject_arrays(
+    file: "Union[str, Path]",
+    arrays: "List[Tuple[List[str], tomlkit.items.Array]]",
+    *,
+    dry_run: bool,
+) -> bool:
+    # create temp dir, generate, and check if changed
+    with atomic_gen_file_ctx(file=file, dry_run=dry_run) as gen_info:
+        toml_file_replace_arrays(
+            file=gen_info.temp_path,
+            arrays=arrays,
+        )
+    return gen_info.changed
+
+
+class _OutputPyproject(_Output):
     output_file: Optional[str] = None
 
+    def get_toml_array_edit(
+        self, mapped_requirements: OutMappedRequirements
+    ) -> "Tuple[List[str], tomlkit.items.Array]":
+        """
+        Get the keys and the generated array to replace in the pyproject.toml file,
+        this allows multiple outputs to the same file to be written together.
+        """
+        raise NotImplementedError(
+            f"tried to get toml array edit for {repr(self.get_output_extras_name())}, get_toml_array_edit not implemented for {self.__class__.__name__}"
+        )
+
     def _write_requirements(
         self, mapped_requirements: OutMappedRequirements, *, dry_run: bool
     ):
+        return _write_pyproject_arrays(
+            self.output_file,
+            [self.get_toml_array_edit(mapped_requirements)],
+            dry_run=dry_run,
+        )
+
+
+class _OutputPyprojectOptionalDeps(_OutputPyproject):
+    output_mode: Literal[OutputModeEnum.optional_dependencies]
+
+    def get_toml_array_edit(
+        self, mapped_requirements: OutMappedRequirements
+    ) -> "Tuple[List[str], tomlkit.items.Array]":
         array = mapped_requirements.as_toml_array(
             notice=True,
             sources=True,
@@ -455,23 +509,15 @@ class _OutputPyprojectOptionalDeps(_Output):
         LOGGER.info(
             f"writing optional dependencies: {repr(out_name)} to: {self.output_file}"
         )
-        # create temp dir, generate, and check if changed
-        with atomic_gen_file_ctx(file=self.output_file, dry_run=dry_run) as gen_info:
-            toml_file_replace_array(
-                file=gen_info.temp_path,
-                keys=["project", "optional-dependencies", out_name],
-                array=array,
-            )
-        return gen_info.changed
+        return ["project", "optional-dependencies", out_name], array
 
 
-class _OutputPyprojectDeps(_Output):
+class _OutputPyprojectDeps(_OutputPyproject):
     output_mode: Literal[OutputModeEnum.dependencies]
-    output_file: Optional[str] = None
 
-    def _write_requirements(
-        self, mapped_requirements: OutMappedRequirements, *, dry_run: bool
-    ):
+    def get_toml_array_edit(
+        self, mapped_requirements: OutMappedRequirements
+    ) -> "Tuple[List[str], tomlkit.items.Array]":
         array = mapped_requirements.as_toml_array(
             notice=True,
             sources=True,
@@ -480,14 +526,7 @@ class _OutputPyprojectDeps(_Output):
             indent_size=4,
         )
         LOGGER.info(f"writing dependencies to: {self.output_file}")
-        # create temp dir, generate, and check if changed
-        with atomic_gen_file_ctx(file=self.output_file, dry_run=dry_run) as gen_info:
-            toml_file_replace_array(
-                file=gen_info.temp_path,
-                keys=["project", "dependencies"],
-                array=array,
-            )
-        return gen_info.changed
+        return ["project", "dependencies"], array
 
 
 CfgResolver = Annotated[
@@ -572,11 +611,14 @@ class CfgVersion(pydantic.BaseModel, extra="forbid", arbitrary_types_allowed=Tru
     # only apply this import to this environment
     env: str = DEFAULT_REQUIREMENTS_ENV
 
-    @property
+    # cached, requirements are parsed and normalized many times during validation
+    # and when constructing the requirements mapper.
+
+    @functools.cached_property
     def parsed_requirement(self) -> Requirement:
         return Requirement(self.requirement)
 
-    @property
+    @functools.cached_property
     def package(self) -> str:
         return normalize_pkg_name(self.parsed_requirement.name, strict=False)
 
@@ -741,18 +783,15 @@ class CfgScope(_ScopeRules, extra="forbid"):
 
         # 4. filter everything
         # - a. limit, b. exclude, [c. include (replaced with parents)]
+        restrictions = []
         if self.limit:
-            m = m.get_restricted_scope(
-                imports=self.limit,
-                mode=RestrictMode.CHILDREN,
-                op=RestrictOp.LIMIT,
-            )
+            restrictions.append((RestrictOp.LIMIT, self.limit, RestrictMode.CHILDREN))
         if self.exclude:
-            m = m.get_restricted_scope(
-                imports=self.exclude,
-                mode=RestrictMode.CHILDREN,
-                op=RestrictOp.EXCLUDE,
+            restrictions.append(
+                (RestrictOp.EXCLUDE, self.exclude, RestrictMode.CHILDREN)
             )
+        if restrictions:
+            m = m.get_restricted_scope_multi(restrictions)
 
         # done!
         return m
@@ -815,48 +854,44 @@ class PydependenceCfg(pydantic.BaseModel, extra="forbid"):
     versions: List[CfgVersion] = pydantic.Field(default_factory=list)
 
     # resolve
-    scopes: List[CfgScope] = pydantic.Field(default_factory=dict)
+    scopes: List[CfgScope] = pydantic.Field(default_factory=list)
 
     # outputs
     resolvers: List[CfgResolver] = pydantic.Field(default_factory=list)
 
     @pydantic.field_validator("versions", mode="before")
     @classmethod
-    def _validate_versions(cls, v, values):
-        versions = []
+    def _validate_versions(cls, v):
+        # only normalize, pydantic then validates the whole list in one go
+        return [{"requirement": x} if isinstance(x, str) else x for x in v]
+
+    @pydantic.field_validator("versions", mode="after")
+    @classmethod
+    def _validate_versions_unique(cls, v: "List[CfgVersion]"):
         reqs_envs = set()  # pairs of tags and req names must be unique for now
         for x in v:
-            if isinstance(x, str):
-                x = CfgVersion.from_string(x)
-            else:
-                x = CfgVersion.model_validate(x)
             req_env = (x.package, x.env)
             if req_env in reqs_envs:
                 raise ValueError(
                     f"requirement {repr(x.package)} and env {repr(x.env)} combination is defined multiple times! ({repr(x.requirement)})"
                 )
             reqs_envs.add(req_env)
-            versions.append(x)
-        return versions
+        return v
 
     @pydantic.model_validator(mode="after")
     @classmethod
     def _validate_model(cls, cfg: "PydependenceCfg"):
         # 1. check that scope names are all unique
-        scope_names = set()
-        for scope in cfg.scopes:
-            if scope.name in scope_names:
-                raise ValueError(f"scope name {repr(scope.name)} is not unique!")
-            scope_names.add(scope.name)
+        scope_names = Counter(scope.name for scope in cfg.scopes)
+        duplicates = [name for name, count in scope_names.items() if count > 1]
+        if duplicates:
+            raise ValueError(f"scope names are not unique: {duplicates}")
 
         # 2. check that all sub-scope names are unique
-        for scope in cfg.scopes:
-            for subscope_name in scope.subscopes:
-                if subscope_name in scope_names:
-                    raise ValueError(
-                        f"sub-scope name {repr(subscope_name)} is not unique!"
-                    )
-                scope_names.add(subscope_name)
+        scope_names.update(name for scope in cfg.scopes for name in scope.subscopes)
+        duplicates = [name for name, count in scope_names.items() if count > 1]
+        if duplicates:
+            raise ValueError(f"sub-scope names are not unique: {duplicates}")
 
         # 3. check that all packages
         # TODO
@@ -882,8 +917,16 @@ class PydependenceCfg(pydantic.BaseModel, extra="forbid"):
             config_path.parent, self.default_root
         )
 
+        # scopes and resolvers often share the same paths, only resolve these once
+        resolved_paths: "Dict[str, str]" = {}
+
         def _resolve_path(x: "Union[str, Path]") -> str:
-            return apply_root_to_path_str(self.default_root, x)
+            x = str(x)
+            path = resolved_paths.get(x, None)
+            if path is None:
+                path = apply_root_to_path_str(self.default_root, x)
+                resolved_paths[x] = path
+            return path
 
         # apply to all paths
         for scope in self.scopes:
@@ -936,12 +979,11 @@ class PydependenceCfg(pydantic.BaseModel, extra="forbid"):
         self,
         loaded_scopes: "LoadedScopes",
     ):
-        env_matchers = defaultdict(list)
+        env_matchers: "Dict[str, List[ReqMatcher]]" = {}
         for v in self.versions:
             import_matcher = v.get_import_matcher(loaded_scopes=loaded_scopes)
             pair = ReqMatcher(requirement=v.requirement, matcher=import_matcher)
-            env_matchers[v.env].append(pair)
-        env_matchers = dict(env_matchers)
+            env_matchers.setdefault(v.env, []).append(pair)
 
         return RequirementsMapper(
             env_matchers=env_matchers,
@@ -953,27 +995,18 @@ class PydependenceCfg(pydantic.BaseModel, extra="forbid"):
         *,
         dry_run: bool = False,
     ) -> bool:
-        # check that scope output names are unique
+        # check that scope output names are unique, and that the scopes exists
         # - output names only need to be unique if they are optional-dependencies!
         # - warn if generally not unique, error if optional-deps not unique
-        names_all = set()
-        names_optional_deps = set()
+        names_all = Counter()
+        names_optional_deps = Counter()
         for output in self.resolvers:
+            # * names
             name = output.get_output_extras_name()
-            if name in names_all:
-                warnings.warn(
-                    f"output name {repr(name)} is not unique across all resolvers!"
-                )
-            names_all.add(name)
+            names_all[name] += 1
             if output.output_mode == OutputModeEnum.optional_dependencies:
-                if name in names_optional_deps:
-                    raise ValueError(
-                        f"output name {repr(name)} is not unique across resolvers for optional dependencies!"
-                    )
-                names_optional_deps.add(name)
-
-        # check that the scopes exists
-        for output in self.resolvers:
+                names_optional_deps[name] += 1
+            # * scopes
             if output.scope is None:
                 assert output.start_scope is None
                 continue
@@ -985,18 +1018,62 @@ class PydependenceCfg(pydantic.BaseModel, extra="forbid"):
                 raise ValueError(
                     f"output start_scope {repr(output.start_scope)} does not exist! Are you sure it has been defined? Available scopes: {loaded_scopes.sorted_names}"
                 )
+        duplicates = [name for name, count in names_optional_deps.items() if count > 1]
+        if duplicates:
+            raise ValueError(
+                f"output names are not unique across resolvers for optional dependencies: {duplicates}"
+            )
+        for name, count in names_all.items():
+            if count > 1:
+                warnings.warn(
+                    f"output name {repr(name)} is not unique across all resolvers!"
+                )
+
+        # parse all modules that will be resolved up-front, in parallel if there are many
+        DEFAULT_MODULE_IMPORTS_LOADER.preload(
+            node_data.module_info
+            for output in self.resolvers
+            if output.scope is not None
+            for _, node_data in loaded_scopes[output.scope].iter_module_items()
+            if node_data.module_info is not None
+        )
 
         # make the mapper
         requirements_mapper = self.make_requirements_mapper(loaded_scopes=loaded_scopes)
 
         # resolve the scopes!
+        # - outputs to the same pyproject.toml are grouped and written together, as
+        #   soon as the last output in the group has been resolved. If any output in
+        #   a group fails to resolve, then nothing in that group is written.
         changed = False
+        pyproject_remaining = Counter(
+            output.output_file
+            for output in self.resolvers
+            if isinstance(output, _OutputPyproject)
+        )
+        pyproject_arrays: "Dict[str, List[Tuple[List[str], tomlkit.items.Array]]]" = {}
         for output in self.resolvers:
-            diff = output.resolve_generate_and_write_requirements(
-                loaded_scopes=loaded_scopes,
-                requirements_mapper=requirements_mapper,
-                dry_run=dry_run,
-            )
+            if isinstance(output, _OutputPyproject):
+                file = output.output_file
+                mapped_requirements = output.resolve_and_generate_requirements(
+                    loaded_scopes=loaded_scopes,
+                    requirements_mapper=requirements_mapper,
+                )
+                pyproject_arrays.setdefault(file, []).append(
+                    output.get_toml_array_edit(mapped_requirements)
+                )
+                pyproject_remaining[file] -= 1
+                if pyproject_remaining[file] > 0:
+                    continue
+                diff = _write_pyproject_arrays(
+                    file, pyproject_arrays.pop(file), dry_run=dry_run
+                )
+            else:
+                diff = output.resolve_generate_and_write_requirements(
+                    loaded_scopes=loaded_scopes,
+                    requirements_mapper=requirements_mapper,
+                    dry_run=dry_run,
+                )
             if diff:
                 changed = True
 
@@ -1007,9 +1084,9 @@ class PydependenceCfg(pydantic.BaseModel, extra="forbid"):
     @classmethod
     def from_pyproject(cls, path: Path) -> "PydependenceCfg":
         # 1. load pyproject.toml
-        toml = load_toml_document(path)
+        toml = load_toml_dict(path)
         # 2. validate the model
-        pyproject = _PyprojectToml.model_validate(toml.unwrap())
+        pyproject = _PyprojectToml.model_validate(toml)
         pydependence = pyproject.tool.pydependence
         # 3. override paths in cfg using the default root
         pydependence.apply_defaults(config_path=path)
@@ -1018,9 +1095,9 @@ class PydependenceCfg(pydantic.BaseModel, extra="forbid"):
     @classmethod
     def from_toml_config(cls, path: Path) -> "PydependenceCfg":
         # 1. load pyproject.toml
-        toml = load_toml_document(path)
+        toml = load_toml_dict(path)
         # 2. validate the model
-        tool = _PyprojectTomlTools.model_validate(toml.unwrap())
+        tool = _PyprojectTomlTools.model_validate(toml)
         pydependence = tool.pydependence
         # 3. override paths in cfg using the default root
         pydependence.apply_defaults(config_path=path)
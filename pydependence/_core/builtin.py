@@ -32,12 +32,14 @@ from stdlib_list import stdlib_list as _stdlib_list
 
 
 # TODO: for python 3.10 and up, can use `sys.stdlib_module_names` or `sys.builtin_module_names`
-BUILTIN_MODULE_NAMES = {
-    # "__main__",
-    # *sys.builtin_module_names,
-    # *sys.stdlib_module_names,
-    *_stdlib_list(),
-}
+BUILTIN_MODULE_NAMES = frozenset(
+    {
+        # "__main__",
+        # *sys.builtin_module_names,
+        # *sys.stdlib_module_names,
+        *_stdlib_list(),
+    }
+)
 
 
 __all__ = ("BUILTIN_MODULE_NAMES",)
@@ -22,7 +22,9 @@
 # SOFTWARE.                                                                      #
 # ============================================================================== #
 
+import os
 import pkgutil
+import sys
 import warnings
 from importlib.machinery import FileFinder
 from pathlib import Path
@@ -30,6 +32,25 @@ from typing import Iterator, NamedTuple
 
 from pydependence._core.utils import assert_valid_import_name, assert_valid_tag
 
+# ========================================================================= #
+# HELPER                                                                    #
+# ========================================================================= #
+
+
+def _iter_py_files(path: Path) -> "Iterator[Path]":
+    # like `path.glob("**/*.py")` but faster, scandir entries cache their file type
+    # so no extra `stat` calls are needed. Symlinked dirs are also not followed.
+    dirs = []
+    with os.scandir(path) as it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                dirs.append(entry.path)
+            elif entry.name.endswith(".py") and entry.is_file():
+                yield Path(entry.path)
+    for d in dirs:
+        yield from _iter_py_files(d)
+
+
 # ========================================================================= #
 # MODULE INFO                                                               #
 # ========================================================================= #
@@ -45,7 +66,7 @@ class ModuleMetadata(NamedTuple):
 
     @property
     def root_name(self) -> str:
-        return self.name.split(".")[0]
+        return self.name.partition(".")[0]
 
     @property
     def tagged_name(self):
@@ -86,17 +107,19 @@ class ModuleMetadata(NamedTuple):
             raise FileNotFoundError(f"Subpath must be an existing file, got: {subpath}")
         tag = assert_valid_tag(tag)
         rel = subpath.relative_to(root)
+        # names are interned, these are used as keys across many graphs and
+        # scopes, and are the same strings as the (interned) import targets.
         if rel.name == "__init__.py":
             return ModuleMetadata(
                 path=subpath,
-                name=".".join(rel.parts[:-1]),
+                name=sys.intern(".".join(rel.parts[:-1])),
                 ispkg=True,
                 tag=tag,
             )
         else:
             return ModuleMetadata(
                 path=subpath,
-                name=".".join(rel.parts)[: -len(".py")],
+                name=sys.intern(".".join(rel.parts)[: -len(".py")]),
                 ispkg=False,
                 tag=tag,
             )
@@ -107,7 +130,7 @@ class ModuleMetadata(NamedTuple):
     ) -> "Iterator[ModuleMetadata]":
         def _visit(p: Path):
             if p.is_dir():
-                yield from p.glob("**/*.py")
+                yield from _iter_py_files(p)
             else:
                 raise ValueError(f"Invalid path: {p}")
 
@@ -130,7 +153,7 @@ class ModuleMetadata(NamedTuple):
             if p.is_file():
                 yield p
             elif p.is_dir():
-                yield from p.glob("**/*.py")
+                yield from _iter_py_files(p)
             else:
                 raise ValueError(f"Invalid path: {p}")
 
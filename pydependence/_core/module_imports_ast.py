@@ -144,6 +144,18 @@ _LAZY_ATTRIBUTE_CALLABLES = {
 # lazy
 _LAZY_CALLABLES = {*_LAZY_IMPORT_CALLABLES, *_LAZY_ATTRIBUTE_CALLABLES}
 
+# these nodes can never contain import statements, only expressions. Imports can then
+# only be reached through lazy import callables, so if a module does not reference
+# any of these callables, we can skip visiting these nodes entirely.
+_EXPRESSION_NODE_TYPES = (
+    ast.expr,
+    ast.arguments,
+    ast.arg,
+    ast.keyword,
+    ast.withitem,
+    ast.comprehension,
+)
+
 
 # ========================================================================= #
 # AST IMPORT PARSER                                                         #
@@ -159,6 +171,9 @@ class ImportSourceEnum(str, Enum):
 
 @dataclasses.dataclass
 class BasicImportInfo:
+    # there are many instances of these, declared manually for python<3.10 support
+    __slots__ = ("target", "source_name", "is_lazy")
+
     # target
     target: str
     source_name: str
@@ -166,7 +181,7 @@ class BasicImportInfo:
 
     @property
     def root_target(self) -> str:
-        return self.target.split(".")[0]
+        return self.target.partition(".")[0]
 
 
 class ManualSource:
@@ -210,6 +225,15 @@ class ManualImportInfo(BasicImportInfo):
 
 @dataclasses.dataclass
 class LocImportInfo(BasicImportInfo):
+    __slots__ = (
+        "source_module_info",
+        "source_type",
+        "lineno",
+        "col_offset",
+        "stack_type_names",
+        "is_relative",
+    )
+
     # source, e.g. import statement or type check or lazy plugin
     source_name: str
     source_module_info: ModuleMetadata
@@ -232,8 +256,9 @@ class LocImportInfo(BasicImportInfo):
 
 class _AstImportsCollector(ast.NodeVisitor):
 
-    def __init__(self, module_info: ModuleMetadata):
+    def __init__(self, module_info: ModuleMetadata, statements_only: bool = False):
         self._module_info: ModuleMetadata = module_info
+        self._statements_only: bool = statements_only
         self._imports: "DefaultDict[str, List[LocImportInfo]]" = defaultdict(list)
         self._stack_is_lazy: "List[bool]" = [False]
         self._stack_ast_kind: "List[str]" = []
@@ -259,6 +284,8 @@ class _AstImportsCollector(ast.NodeVisitor):
         is_lazy: "Optional[bool]" = None,
         is_relative: bool = False,
     ):
+        # the same targets are imported by many modules, share a single string
+        target = sys.intern(target)
         import_ = LocImportInfo(
             source_name=self._module_info.name,
             source_module_info=self._module_info,
@@ -278,6 +305,8 @@ class _AstImportsCollector(ast.NodeVisitor):
         kind = node.__class__.__name__
         if kind in _DISALLOWED_IMPORT_STATEMENT_NODES:
             return
+        if self._statements_only and isinstance(node, _EXPRESSION_NODE_TYPES):
+            return
         # push - basic interpreter
         is_lazy = self._stack_is_lazy[-1] or (kind in _IS_INDIRECT_NODE)
         self._stack_ast_kind.append(kind)
@@ -441,14 +470,23 @@ class _AstImportsCollector(ast.NodeVisitor):
     def load_imports_from_module_info(
         cls, module_info: ModuleMetadata, *, debug: bool = False
     ) -> "Dict[str, List[LocImportInfo]]":
-        # load the file & parse
+        # load the file
         path = assert_valid_module_path(module_info.path)
         name = assert_valid_import_name(module_info.name)
         with open(path) as fp:
             _dat = fp.read()
-            _ast = ast.parse(_dat)
+        # - if no lazy import callables are referenced, imports can only be statements
+        statements_only = not any(c in _dat for c in _LAZY_CALLABLES)
+        # parse, always done so that syntax errors are still raised
+        _ast = ast.parse(_dat)
+        # - all import statements contain the `import` keyword, if it is never
+        #   referenced then there is nothing to find and we can skip visiting.
+        if statements_only and ("import" not in _dat):
+            return defaultdict(list)
         # collect imports
-        _parser = _AstImportsCollector(module_info=module_info)
+        _parser = _AstImportsCollector(
+            module_info=module_info, statements_only=statements_only
+        )
         _parser.visit(_ast)
         # debug
         if debug:
@@ -24,8 +24,17 @@
 
 
 import dataclasses
-from typing import Dict, List, Tuple
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple, Type, Union
 
+import pydependence._core.module_imports_ast as _module_imports_ast
 from pydependence._core.module_data import ModuleMetadata
 from pydependence._core.module_imports_ast import (
     LocImportInfo,
@@ -39,6 +48,8 @@ from pydependence._core.module_imports_ast import (
 
 @dataclasses.dataclass
 class ModuleImports:
+    __slots__ = ("module_info", "module_imports")
+
     module_info: ModuleMetadata
     module_imports: "Dict[str, List[LocImportInfo]]"
 
@@ -56,31 +67,261 @@ class ModuleImports:
 # ========================================================================= #
 
 
+# bump this if the structure of the cached imports changes
+_DISK_CACHE_VERSION = "ast-v3"
+
+
+# override the cache location, or set to an empty string to disable the cache
+_DISK_CACHE_DIR_ENV = "PYDEPENDENCE_CACHE_DIR"
+
+
+def _get_default_cache_dir() -> "Optional[Path]":
+    root = os.environ.get(_DISK_CACHE_DIR_ENV, None)
+    if root is None:
+        root = Path(os.environ.get("XDG_CACHE_HOME") or "~/.cache") / "pydependence"
+    elif not root:
+        return None
+    return Path(root).expanduser() / _DISK_CACHE_VERSION
+
+
+# below this many modules, starting worker processes costs more than it saves
+_PRELOAD_MIN_PARALLEL = 64
+
+
+class _ModuleWarning(NamedTuple):
+    message: str
+    category: "Type[Warning]"
+    filename: str
+    lineno: int
+
+
+def _parse_module_imports(
+    module_info: ModuleMetadata,
+) -> "Tuple[Dict[str, List[LocImportInfo]], List[_ModuleWarning]]":
+    # module level so that it can be sent to worker processes
+    # - warnings raised while parsing, e.g. about invalid lazy imports, are recorded
+    #   so that they can be replayed in the parent process, where the user's filters
+    #   apply, and again whenever the results are later loaded from the disk cache.
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        module_imports = dict(load_imports_from_module_info(module_info=module_info))
+    module_warnings = [
+        _ModuleWarning(str(w.message), w.category, w.filename, w.lineno) for w in caught
+    ]
+    return module_imports, module_warnings
+
+
+def _replay_module_warnings(module_warnings: "List[_ModuleWarning]") -> None:
+    for w in module_warnings:
+        warnings.warn_explicit(
+            message=w.message,
+            category=w.category,
+            filename=w.filename,
+            lineno=w.lineno,
+        )
+
+
+def _intern_module_imports(
+    module_info: ModuleMetadata,
+    module_imports: "Dict[str, List[LocImportInfo]]",
+) -> "Dict[str, List[LocImportInfo]]":
+    # unpickled strings are not interned, e.g. from the disk cache or from worker
+    # processes, re-intern these so targets shared across modules are deduplicated.
+    # - each import also has its own unpickled copy of the module info, share ours.
+    interned = {}
+    for target, imports in module_imports.items():
+        target = sys.intern(target)
+        for import_ in imports:
+            import_.target = target
+            import_.source_name = module_info.name
+            import_.source_module_info = module_info
+        interned[target] = imports
+    return interned
+
+
+def _get_disk_cache_salt() -> str:
+    # results depend on the python version (ast) and the parser itself, if the
+    # parser is modified, e.g. updated or during development, then invalidate.
+    parser_stat = os.stat(_module_imports_ast.__file__)
+    return f"{_DISK_CACHE_VERSION}|{sys.version}|{parser_stat.st_mtime_ns}|{parser_stat.st_size}"
+
+
+class _DiskCacheKey(NamedTuple):
+    # one entry per file & metadata, overwritten when the file changes so that
+    # stale entries do not accumulate.
+    path: Path
+    # the entry is only valid if its stamp matches, i.e. the file is unchanged
+    stamp: str
+
+
 class _ModuleImportsLoader:
 
-    def __init__(self):
-        # TODO: tag could severally hurt performance? maybe should change data structure slightly?
-        #       problem is tag is nested and applied to imports too. HOWEVER, Usually tag is
-        #       automatically generated from the package name, so might not matter too much in practice.
-        self._modules_imports: "Dict[Tuple[str, str], ModuleImports]" = {}
+    def __init__(self, cache_dir: "Optional[Union[str, Path]]" = None):
+        # keyed on the full metadata rather than only the path, scopes may load the
+        # same file under a different name or tag, and the parsed imports depend on
+        # these. Lookups with the same instance hit the dict's identity fast path.
+        self._modules_imports: "Dict[ModuleMetadata, ModuleImports]" = {}
+        # persist parsed imports across runs, disabled if None
+        self._cache_dir: "Optional[Path]" = (
+            Path(cache_dir) if cache_dir is not None else None
+        )
+        self._cache_salt: "Optional[str]" = None
+
+    # ~=~=~ DISK CACHE ~=~=~ #
+
+    def _get_disk_cache_key(
+        self, module_info: ModuleMetadata
+    ) -> "Optional[_DiskCacheKey]":
+        if self._cache_dir is None:
+            return None
+        if self._cache_salt is None:
+            self._cache_salt = _get_disk_cache_salt()
+        # the parsed imports depend on the file contents AND the module metadata
+        # because relative imports and sources are computed from the name & tag.
+        h = hashlib.blake2b(digest_size=20)
+        h.update(
+            f"{module_info.path}|{module_info.name}|{module_info.ispkg}|{module_info.tag}".encode()
+        )
+        key = h.hexdigest()
+        st = os.stat(module_info.path)
+        return _DiskCacheKey(
+            path=self._cache_dir / key[:2] / f"{key}.pkl",
+            stamp=f"{self._cache_salt}|{st.st_mtime_ns}|{st.st_size}",
+        )
+
+    def _disk_cache_load(
+        self, key: _DiskCacheKey
+    ) -> "Optional[Tuple[Dict[str, List[LocImportInfo]], List[_ModuleWarning]]]":
+        try:
+            with open(key.path, "rb") as fp:
+                stamp, module_imports, module_warnings = pickle.load(fp)
+        except Exception:
+            # missing, corrupt or incompatible entry, will be (re-)generated
+            return None
+        # outdated entry, will be overwritten
+        if stamp != key.stamp:
+            return None
+        return module_imports, module_warnings
+
+    def _disk_cache_save(
+        self,
+        key: _DiskCacheKey,
+        module_imports: "Dict[str, List[LocImportInfo]]",
+        module_warnings: "List[_ModuleWarning]",
+    ) -> None:
+        # the cache is best-effort, e.g. the cache dir might be read-only
+        try:
+            key.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, temp = tempfile.mkstemp(dir=key.path.parent, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as fp:
+                    pickle.dump(
+                        (key.stamp, module_imports, module_warnings),
+                        fp,
+                        protocol=pickle.HIGHEST_PROTOCOL,
+                    )
+                os.replace(temp, key.path)
+            except BaseException:
+                os.unlink(temp)
+                raise
+        except OSError:
+            pass
+
+    # ~=~=~ LOAD ~=~=~ #
+
+    def _add_module_imports(
+        self,
+        module_info: ModuleMetadata,
+        module_imports: "Dict[str, List[LocImportInfo]]",
+        module_warnings: "List[_ModuleWarning]",
+    ) -> ModuleImports:
+        # warnings are shown each time the imports are loaded into this loader,
+        # regardless of whether they were parsed or loaded from the disk cache
+        _replay_module_warnings(module_warnings)
+        v = ModuleImports(
+            module_info=module_info,
+            module_imports=_intern_module_imports(module_info, module_imports),
+        )
+        self._modules_imports[module_info] = v
+        return v
+
+    def _load_from_disk_cache(
+        self, module_info: ModuleMetadata, key: "Optional[_DiskCacheKey]"
+    ) -> "Optional[ModuleImports]":
+        if key is None:
+            return None
+        results = self._disk_cache_load(key)
+        if results is None:
+            return None
+        return self._add_module_imports(module_info, *results)
+
+    def _load_from_parsed(
+        self,
+        module_info: ModuleMetadata,
+        key: "Optional[_DiskCacheKey]",
+        module_imports: "Dict[str, List[LocImportInfo]]",
+        module_warnings: "List[_ModuleWarning]",
+    ) -> ModuleImports:
+        v = self._add_module_imports(module_info, module_imports, module_warnings)
+        if key is not None:
+            self._disk_cache_save(key, v.module_imports, module_warnings)
+        return v
 
     def load_module_imports(self, module_info: ModuleMetadata) -> ModuleImports:
-        k = (module_info.name, module_info.tag)
-        v = self._modules_imports.get(k, None)
+        v = self._modules_imports.get(module_info, None)
         if v is None:
-            v = ModuleImports.from_module_info_and_parsed_file(module_info)
-            self._modules_imports[k] = v
-        else:
-            if v.module_info != module_info:
-                raise RuntimeError(
-                    f"ModuleMetadata mismatch: {v.module_info} != {module_info}"
+            # stat & hash the file once, shared between the lookup and the store
+            key = self._get_disk_cache_key(module_info)
+            v = self._load_from_disk_cache(module_info, key)
+            if v is None:
+                v = self._load_from_parsed(
+                    module_info, key, *_parse_module_imports(module_info)
                 )
         return v
 
+    def preload(
+        self,
+        module_infos: "Iterable[ModuleMetadata]",
+        *,
+        max_workers: "Optional[int]" = None,
+        min_parallel: int = _PRELOAD_MIN_PARALLEL,
+    ) -> None:
+        """
+        Load the imports of many modules at once so that later calls to
+        `load_module_imports` are cache hits. Modules that are not yet cached are
+        parsed in parallel across multiple processes if there are enough of them.
+        """
+        # 1. filter out modules that are already cached
+        missing, missing_keys = [], []
+        for module_info in dict.fromkeys(module_infos):
+            if module_info in self._modules_imports:
+                continue
+            key = self._get_disk_cache_key(module_info)
+            if self._load_from_disk_cache(module_info, key) is None:
+                missing.append(module_info)
+                missing_keys.append(key)
+        # 2. parse the remaining modules
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+        if max_workers <= 1 or len(missing) < max(min_parallel, 2):
+            for module_info, key in zip(missing, missing_keys):
+                self._load_from_parsed(
+                    module_info, key, *_parse_module_imports(module_info)
+                )
+            return
+        chunksize = max(1, len(missing) // (max_workers * 4))
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = executor.map(_parse_module_imports, missing, chunksize=chunksize)
+            for module_info, key, (module_imports, module_warnings) in zip(
+                missing, missing_keys, results
+            ):
+                self._load_from_parsed(
+                    module_info, key, module_imports, module_warnings
+                )
+
 
 # GLOBAL INSTANCE
-# TODO: can replace with disk cache
-DEFAULT_MODULE_IMPORTS_LOADER = _ModuleImportsLoader()
+DEFAULT_MODULE_IMPORTS_LOADER = _ModuleImportsLoader(cache_dir=_get_default_cache_dir())
 
 
 # ========================================================================= #
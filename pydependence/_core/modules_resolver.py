@@ -22,97 +22,11 @@
 # SOFTWARE.                                                                      #
 # ============================================================================== #
 
-import warnings
-from collections import defaultdict
-from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
-
-import networkx as nx
+from typing import Dict, List, Optional, Set, Tuple
 
 from pydependence._core.builtin import BUILTIN_MODULE_NAMES
-from pydependence._core.module_data import ModuleMetadata
 from pydependence._core.module_imports_ast import LocImportInfo
-from pydependence._core.module_imports_loader import (
-    DEFAULT_MODULE_IMPORTS_LOADER,
-    ModuleImports,
-)
-from pydependence._core.modules_scope import NODE_KEY_MODULE_INFO, ModulesScope
-
-# ========================================================================= #
-# IMPORT GRAPH                                                              #
-# ========================================================================= #
-
-
-NODE_KEY_MODULE_IMPORTS = "module_imports"
-EDGE_KEY_IMPORTS = "imports"
-
-
-class _ImportsGraphNodeData(NamedTuple):
-    module_info: "Optional[ModuleMetadata]"
-    module_imports: "Optional[ModuleImports]"
-
-    @classmethod
-    def from_graph_node(cls, graph: "nx.DiGraph", node: str) -> "_ImportsGraphNodeData":
-        return cls(
-            module_info=graph.nodes[node].get(NODE_KEY_MODULE_INFO, None),
-            module_imports=graph.nodes[node].get(NODE_KEY_MODULE_IMPORTS, None),
-        )
-
-
-class _ImportsGraphEdgeData(NamedTuple):
-    imports: "List[LocImportInfo]"
-
-    @classmethod
-    def from_graph_edge(
-        cls, graph: "nx.DiGraph", src: str, dst: str
-    ) -> "_ImportsGraphEdgeData":
-        edge_data = graph.edges[src, dst]
-        imports = edge_data.get(EDGE_KEY_IMPORTS, [])
-        return cls(imports=imports)
-
-    @property
-    def all_lazy(self) -> bool:
-        return all(imp.is_lazy for imp in self.imports)
-
-
-def _construct_module_import_graph(
-    scope: "ModulesScope",
-    *,
-    visit_lazy: bool,
-) -> "nx.DiGraph":
-    """
-    Supports same interface as `find_modules` but edges are instead constructed
-    from the module imports.
-
-    This is the direct graph where nodes are modules, and edges represent their imports.
-    """
-    g = nx.DiGraph()
-    for node, node_data in scope.iter_module_items():
-        if node_data.module_info is None:
-            warnings.warn(f"Module info not found for: {repr(node)}, skipping...")
-            continue
-        # get module info
-        node_imports: ModuleImports = DEFAULT_MODULE_IMPORTS_LOADER.load_module_imports(
-            module_info=node_data.module_info
-        )
-        # construct nodes & edges between nodes based on imports
-        # - edges don't always exist, so can't just rely on them to add all nodes.
-        g.add_node(
-            node,
-            **{NODE_KEY_MODULE_INFO: node_data, NODE_KEY_MODULE_IMPORTS: node_imports},
-        )
-        for imp, imports in node_imports.module_imports.items():
-            # filter out lazy, or skip
-            if not visit_lazy:
-                imports = [imp for imp in imports if not imp.is_lazy]
-            # add edge
-            if imports:
-                g.add_edge(
-                    node,
-                    imp,
-                    **{EDGE_KEY_IMPORTS: imports},
-                )
-    return g
-
+from pydependence._core.modules_scope import ModulesScope
 
 # ========================================================================= #
 # MODULE GRAPH                                                              #
@@ -137,37 +51,50 @@ def _resolve_scope_imports(
     # 1. construct
     # - if all imports are lazy, then we don't need to traverse them! (depending on mode)
     # - we have to filter BEFORE the bfs otherwise we will traverse wrong nodes.
-    import_graph = _construct_module_import_graph(scope=scope, visit_lazy=visit_lazy)
+    adjacency = scope._get_import_adjacency(visit_lazy=visit_lazy)
 
     # 2. now resolve imports from the starting point!
-    # - dfs along edges to get all imports MUST do ALL edges
-    # - this is why we don't use `dfs_edges` which visits nodes, and may skip edges.
+    # - dfs along edges to get all imports MUST do ALL edges, this is the same as
+    #   `nx.edge_dfs`, each reachable node has all of its out edges visited once.
     # - each edge contains all imports along that edge, these should
     #   be added to the set of imports so that we can track all imports
+    # - all start nodes share the same traversal, so this is O(V + E) regardless of
+    #   the number of start nodes. Precomputing the transitive closure of each node
+    #   is not worth it, the output is already O(E) & closures need O(V^2) memory.
+    # - cyclic imports are common, but each node is only expanded once, so cycles
+    #   are never re-traversed. Condensing SCCs first would not improve the bound.
     visited = set()
     imports = []
-    for src, dst in nx.edge_dfs(import_graph, source=start_scope.iter_modules()):
-        edge_data = _ImportsGraphEdgeData.from_graph_edge(import_graph, src, dst)
-        imports.extend(edge_data.imports)
-        visited.update([src, dst])
-    # - dfs may not add all nodes, but these should be visited too
-    for node in start_scope.iter_modules():
-        if import_graph.has_node(node):
-            visited.add(node)
+    expanded = set()
+    stack = list(start_scope.iter_modules())
+    while stack:
+        src = stack.pop()
+        if src in expanded:
+            continue
+        expanded.add(src)
+        for dst, dst_imports in adjacency.get(src, {}).items():
+            imports.extend(dst_imports)
+            visited.add(src)
+            visited.add(dst)
+            if dst not in expanded:
+                stack.append(dst)
+    # - dfs may not add all nodes, but these should be visited too if they are
+    #   in the graph, i.e. they are in the scope or are imported by the scope.
+    missing = [n for n in start_scope.iter_modules() if n not in visited]
+    if missing:
+        targets = {dst for edges in adjacency.values() for dst in edges}
+        visited.update(n for n in missing if (n in adjacency) or (n in targets))
 
     # 3. re_add lazy imports
     #    - when visit_lazy is False, all lazy imports are filtered out before BFS, this
     #      means that we need to re-add them from the visited nodes.
     if re_add_lazy and not visit_lazy:
-        import_graph = _construct_module_import_graph(scope=scope, visit_lazy=True)
+        adjacency = scope._get_import_adjacency(visit_lazy=True)
         for node in visited:
             # get edges directed out of the node
-            for src, dst in import_graph.out_edges(node):
-                edge_data = _ImportsGraphEdgeData.from_graph_edge(
-                    import_graph, src, dst
-                )
+            for dst_imports in adjacency.get(node, {}).values():
                 # only add lazy imports, because these would have been filtered out
-                for imp in edge_data.imports:
+                for imp in dst_imports:
                     if imp.is_lazy:
                         imports.append(imp)
 
@@ -223,10 +150,12 @@ class ScopeResolvedImports:
         exclude_builtins: bool = True,
     ) -> "ScopeResolvedImports":
 
+        scope_names = self._scope._get_module_names()
+
         def _keep(imp: LocImportInfo) -> bool:
             if exclude_builtins and imp.target in BUILTIN_MODULE_NAMES:
                 return False
-            if exclude_in_search_space and self._scope.has_module(imp.target):
+            if exclude_in_search_space and imp.target in scope_names:
                 return False
             if exclude_unvisited and imp.source_name not in self._visited:
                 return False
@@ -246,13 +175,11 @@ class ScopeResolvedImports:
 
     def _get_targets_sources_counts(self) -> "Dict[str, Dict[str, int]]":
         # used for debugging / testing
-        trg_src_imps = defaultdict(lambda: defaultdict(list))
+        trg_src_counts: "Dict[str, Dict[str, int]]" = {}
         for imp in self._imports:
-            trg_src_imps[imp.target][imp.source_name].append(imp)
-        return {
-            trg: {src: len(imps) for src, imps in src_imps.items()}
-            for trg, src_imps in trg_src_imps.items()
-        }
+            src_counts = trg_src_counts.setdefault(imp.target, {})
+            src_counts[imp.source_name] = src_counts.get(imp.source_name, 0) + 1
+        return trg_src_counts
 
 
 # ========================================================================= #
@@ -21,6 +21,8 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE  #
 # SOFTWARE.                                                                      #
 # ============================================================================== #
+import functools
+import sys
 import warnings
 from collections import defaultdict
 from enum import Enum
@@ -28,6 +30,7 @@ from pathlib import Path
 from typing import (
     TYPE_CHECKING,
     Dict,
+    FrozenSet,
     Iterable,
     Iterator,
     List,
@@ -41,8 +44,72 @@ from typing import (
 import networkx as nx
 
 from pydependence._core.module_data import ModuleMetadata
+from pydependence._core.module_imports_loader import (
+    DEFAULT_MODULE_IMPORTS_LOADER,
+    ModuleImports,
+)
 from pydependence._core.utils import assert_valid_import_name
 
+if TYPE_CHECKING:
+    from pydependence._core.module_imports_ast import LocImportInfo
+
+# ========================================================================= #
+# IMPORT GRAPH                                                              #
+# ========================================================================= #
+
+
+def _construct_module_import_adjacency(
+    scope: "ModulesScope",
+) -> "Dict[str, Dict[str, List[LocImportInfo]]]":
+    """
+    Construct the direct import graph of the scope as plain adjacency lists
+    `{src: {dst: imports, ...}, ...}`, which are much faster to build and traverse
+    than a networkx graph.
+
+    Only modules in the scope have entries, imported modules outside of the scope
+    only appear as destinations.
+    """
+    # split out modules without info once, so the loops below never see them
+    module_items = []
+    for node, node_data in scope.iter_module_items():
+        if node_data.module_info is None:
+            warnings.warn(f"Module info not found for: {repr(node)}, skipping...")
+        else:
+            module_items.append((node, node_data.module_info))
+    # construct the adjacency lists
+    # - imports are loaded lazily, library code should never spawn worker processes,
+    #   callers that want parallel parsing should `preload` first, like the cli does.
+    adjacency = {}
+    for node, module_info in module_items:
+        node_imports: ModuleImports = DEFAULT_MODULE_IMPORTS_LOADER.load_module_imports(
+            module_info=module_info
+        )
+        adjacency[node] = {
+            imp: imports
+            for imp, imports in node_imports.module_imports.items()
+            if imports
+        }
+    return adjacency
+
+
+def _filter_module_import_adjacency_lazy(
+    adjacency: "Dict[str, Dict[str, List[LocImportInfo]]]",
+) -> "Dict[str, Dict[str, List[LocImportInfo]]]":
+    """
+    Remove all lazy imports from the adjacency lists, as well as edges that only
+    consisted of lazy imports. This avoids re-loading the imports of every module.
+    """
+    filtered = {}
+    for src, edges in adjacency.items():
+        filtered_edges = {}
+        for dst, imports in edges.items():
+            imports = [imp for imp in imports if not imp.is_lazy]
+            if imports:
+                filtered_edges[dst] = imports
+        filtered[src] = filtered_edges
+    return filtered
+
+
 # ========================================================================= #
 # MODULE GRAPH                                                              #
 # ========================================================================= #
@@ -63,6 +130,20 @@ class DuplicateModulePathsError(DuplicateModulesError):
     pass
 
 
+@functools.lru_cache(maxsize=16384)
+def _get_name_prefixes(name: str) -> "Tuple[str, ...]":
+    # e.g. "a.b.c" -> ("a", "a.b", "a.b.c"), cached because scopes are filtered
+    #      repeatedly and the same names are split every time. Bounded so that
+    #      long-running processes do not keep every module name ever seen alive.
+    prefixes = []
+    i = name.find(".")
+    while i != -1:
+        prefixes.append(name[:i])
+        i = name.find(".", i + 1)
+    prefixes.append(name)
+    return tuple(prefixes)
+
+
 class _ModuleGraphNodeData(NamedTuple):
     module_info: "Optional[ModuleMetadata]"
 
@@ -152,36 +233,43 @@ def _find_modules(
     _assert_no_duplicate_paths(g)
 
     # add all connections to parent packages
-    for node in g.nodes:
-        parts = node.split(".")
-        if len(parts) > 1:
-            parent = ".".join(parts[:-1])
-            if g.has_node(parent):
-                g.add_edge(parent, node)
+    # - all nodes are known up-front, so compute the edges in one pass and add together
+    nodes = g.nodes
+    edges = []
+    for node in nodes:
+        parent = node.rpartition(".")[0]
+        if parent and (parent in nodes):
+            edges.append((parent, node))
+    g.add_edges_from(edges)
 
     # make sure there are no empty nodes, this is a bug!
     if "" in g.nodes:
         raise RuntimeError(f"[BUG] Empty module name found in graph: {g}")
 
-    # reverse traverse from each node to the root to figure out which nodes are reachable, then filter them out.
+    # traverse from the roots to figure out which nodes are reachable, then filter them out.
     if unreachable_mode in (UnreachableModeEnum.skip, UnreachableModeEnum.error):
-        reverse = g.reverse()
-        for node in list(g.nodes):
-            root = node.split(".")[0]
-            try:
-                has_path = nx.has_path(reverse, node, root)
-            except nx.NodeNotFound as e:
-                if not reverse.has_node(node):
-                    raise nx.NodeNotFound(f"Node not found: {node}") from e
-                else:
-                    raise nx.NodeNotFound(f"Root node not found: {root}") from e
-            if not has_path:
-                if unreachable_mode == UnreachableModeEnum.error:
-                    raise UnreachableModuleError(
-                        f"Unreachable module found: {node} from root: {root}, module is probably not marked as a package or is missing an __init__.py file!"
-                    )
-                else:
-                    g.remove_node(node)
+        # - edges only point from parents to children, so a single traversal down
+        #   from all the roots finds every node that has a path to its own root.
+        reachable = set()
+        stack = [node for node in g.nodes if "." not in node]
+        while stack:
+            node = stack.pop()
+            if node not in reachable:
+                reachable.add(node)
+                stack.extend(g.successors(node))
+        unreachable = []
+        for node in g.nodes:
+            if node in reachable:
+                continue
+            root = _get_name_prefixes(node)[0]
+            if not g.has_node(root):
+                raise nx.NodeNotFound(f"Root node not found: {root}")
+            if unreachable_mode == UnreachableModeEnum.error:
+                raise UnreachableModuleError(
+                    f"Unreachable module found: {node} from root: {root}, module is probably not marked as a package or is missing an __init__.py file!"
+                )
+            unreachable.append(node)
+        g.remove_nodes_from(unreachable)
 
     # * DiGraph [ import_path -> Node(module_info) ]
     return g
@@ -207,8 +295,10 @@ class ModulesScope:
 
     def __init__(self):
         self._module_graph = nx.DiGraph()
+        self.__module_names = None
         self.__import_graph_strict = None
         self.__import_graph_lazy = None
+        self.__import_graph_reverse = {}
 
     # ~=~=~ ADD MODULES ~=~=~ #
 
@@ -216,15 +306,17 @@ class ModulesScope:
         # 1.a check all file paths
         _assert_no_duplicate_paths(self._module_graph, graph)
         # 1.b get all nodes that are in both search spaces
-        nodes = set(self._module_graph.nodes) & set(graph.nodes)
+        nodes = self._get_module_names().intersection(graph.nodes)
         if nodes:
             raise DuplicateModuleNamesError(
                 f"Duplicate module names found: {sorted(nodes)}"
             )
         # 2. add all nodes from the other search space
         self._module_graph = nx.compose(self._module_graph, graph)
+        self.__module_names = None
         self.__import_graph_strict = None
         self.__import_graph_lazy = None
+        self.__import_graph_reverse = {}
         return self
 
     def add_modules_from_scope(self, search_space: "ModulesScope") -> "ModulesScope":
@@ -235,7 +327,7 @@ class ModulesScope:
     ) -> "ModulesScope":
         g = nx.DiGraph()
         for imp in imports:
-            g.add_node(imp)
+            g.add_node(sys.intern(imp))
         return self._merge_module_graph(graph=g)
 
     def add_modules_from_search_path(
@@ -293,20 +385,42 @@ class ModulesScope:
 
     # ~=~=~ SCOPE OPS ~=~=~ #
 
+    def _get_module_names(self) -> "FrozenSet[str]":
+        # cached, set operations on node views are implemented in python, whereas
+        # a frozenset runs these natively. Invalidated when modules are merged in.
+        if self.__module_names is None:
+            self.__module_names = frozenset(self._module_graph.nodes)
+        return self.__module_names
+
+    # * the identity and size checks avoid building the name sets when possible,
+    #   e.g. scopes are often resolved with themselves as the start scope.
+
     def is_scope_parent_set(self, other: "ModulesScope") -> bool:
-        return self._module_graph.nodes <= other._module_graph.nodes
+        if self is other:
+            return True
+        if len(self._module_graph) > len(other._module_graph):
+            return False
+        return self._get_module_names() <= other._get_module_names()
 
     def is_scope_equal(self, other: "ModulesScope") -> bool:
-        return self._module_graph.nodes == other._module_graph.nodes
+        if self is other:
+            return True
+        if len(self._module_graph) != len(other._module_graph):
+            return False
+        return self._get_module_names() == other._get_module_names()
 
     def is_scope_subset(self, other: "ModulesScope") -> bool:
-        return self._module_graph.nodes >= other._module_graph.nodes
+        if self is other:
+            return True
+        if len(self._module_graph) < len(other._module_graph):
+            return False
+        return self._get_module_names() >= other._get_module_names()
 
     def is_scope_conflicts(self, other: "ModulesScope") -> bool:
-        return bool(self._module_graph.nodes & other._module_graph.nodes)
+        return not self._get_module_names().isdisjoint(other._get_module_names())
 
     def get_scope_conflicts(self, other: "ModulesScope") -> Set[str]:
-        return set(self._module_graph.nodes & other._module_graph.nodes)
+        return set(self._get_module_names() & other._get_module_names())
 
     # ~=~=~ FILTER MODULES ~=~=~ #
 
@@ -317,49 +431,103 @@ class ModulesScope:
         mode: RestrictMode = RestrictMode.CHILDREN,
         op: RestrictOp = RestrictOp.LIMIT,
     ) -> "ModulesScope":
-        assert not isinstance(imports, str)
-        imports = set(map(assert_valid_import_name, imports))
-        # copy the graph
-        s = ModulesScope()
-        s._module_graph = self._module_graph.copy()
-
-        # allowed
-        if mode == RestrictMode.ROOT_CHILDREN:
-            allowed = {(i.split("."),) for i in imports}
-        elif mode in (RestrictMode.EXACT, RestrictMode.CHILDREN):
-            allowed = {tuple(i.split(".")) for i in imports}
-        else:
-            raise ValueError(f"Invalid mode: {mode}")
+        return self.get_restricted_scope_multi([(op, imports, mode)])
 
-        # filter the graph
-        for node in list(s._module_graph.nodes):
-            node_parts = tuple(node.split("."))
-            # get the limited set of nodes
-            if mode == RestrictMode.EXACT:
-                remove = node_parts not in allowed
-            elif mode == RestrictMode.ROOT_CHILDREN:
-                remove = node_parts[:1] not in allowed
-            elif mode == RestrictMode.CHILDREN:
-                remove = not any(
-                    node_parts[: i + 1] in allowed for i in range(len(node_parts))
-                )
+    def get_restricted_scope_multi(
+        self,
+        ops: "Iterable[Tuple[RestrictOp, Iterable[str], RestrictMode]]",
+    ) -> "ModulesScope":
+        """
+        Equivalent to chaining calls to `get_restricted_scope` for each of the
+        `(op, imports, mode)` entries, but all the restrictions are applied in
+        a single pass over the modules, and the graph is only copied once.
+        """
+        # compile the restrictions
+        restrictions = []
+        for op, imports, mode in ops:
+            assert not isinstance(imports, str)
+            imports = set(map(assert_valid_import_name, imports))
+            # allowed
+            if mode == RestrictMode.ROOT_CHILDREN:
+                allowed = {_get_name_prefixes(i)[0] for i in imports}
+            elif mode in (RestrictMode.EXACT, RestrictMode.CHILDREN):
+                allowed = imports
             else:
                 raise ValueError(f"Invalid mode: {mode}")
-            # apply the operation
-            if op == RestrictOp.LIMIT:
-                remove = remove
-            elif op == RestrictOp.EXCLUDE:
-                remove = not remove
-            else:
+            # operation
+            if op not in (RestrictOp.LIMIT, RestrictOp.EXCLUDE):
                 raise ValueError(f"Invalid operation: {op}")
-            # remove the node
-            if remove:
-                s._module_graph.remove_node(node)
+            restrictions.append((op == RestrictOp.EXCLUDE, mode, allowed))
+
+        # filter the graph
+        keep_nodes = []
+        for node in self._module_graph.nodes:
+            prefixes = _get_name_prefixes(node)
+            for exclude, mode, allowed in restrictions:
+                # check if the node matches
+                if mode == RestrictMode.EXACT:
+                    matched = node in allowed
+                elif mode == RestrictMode.ROOT_CHILDREN:
+                    matched = prefixes[0] in allowed
+                else:
+                    matched = not allowed.isdisjoint(prefixes)
+                # apply the operation, limit removes nodes that do not match, while
+                # exclude removes nodes that do match.
+                if matched == exclude:
+                    break
+            else:
+                keep_nodes.append(node)
+
+        # copy only the kept part of the graph, scopes are often heavily restricted
+        s = ModulesScope()
+        s._module_graph = self._module_graph.subgraph(keep_nodes).copy()
         # done!
         return s
 
     # ~=~=~ RESOLVE ~=~=~ #
 
+    def _get_import_adjacency(
+        self, *, visit_lazy: bool
+    ) -> "Dict[str, Dict[str, List[LocImportInfo]]]":
+        # cached, resolving multiple start scopes against the same scope should not
+        # need to reconstruct the imports. Invalidated when modules are merged in.
+        if self.__import_graph_lazy is None:
+            self.__import_graph_lazy = _construct_module_import_adjacency(scope=self)
+        if visit_lazy:
+            return self.__import_graph_lazy
+        # - derived from the full adjacency
+        if self.__import_graph_strict is None:
+            self.__import_graph_strict = _filter_module_import_adjacency_lazy(
+                self.__import_graph_lazy
+            )
+        return self.__import_graph_strict
+
+    def _get_import_adjacency_reverse(
+        self, *, visit_lazy: bool
+    ) -> "Dict[str, List[str]]":
+        # cached, inverse of `_get_import_adjacency`: `{dst: [src, ...], ...}`
+        reverse = self.__import_graph_reverse.get(visit_lazy, None)
+        if reverse is None:
+            reverse = defaultdict(list)
+            for src, edges in self._get_import_adjacency(visit_lazy=visit_lazy).items():
+                for dst in edges:
+                    reverse[dst].append(src)
+            reverse = dict(reverse)
+            self.__import_graph_reverse[visit_lazy] = reverse
+        return reverse
+
+    def get_module_importers(
+        self, module_name: str, *, visit_lazy: bool = True
+    ) -> "List[str]":
+        """
+        Get the names of all the modules in this scope that directly import the module.
+        """
+        return list(
+            self._get_import_adjacency_reverse(visit_lazy=visit_lazy).get(
+                module_name, []
+            )
+        )
+
     def resolve_imports(
         self,
         start_scope: "Optional[ModulesScope]" = None,
@@ -23,9 +23,9 @@
 # ============================================================================== #
 import abc
 import dataclasses
-import functools
+import sys
 import warnings
-from typing import TYPE_CHECKING, Dict, List, NamedTuple, Optional, Set, Union
+from typing import TYPE_CHECKING, Dict, List, NamedTuple, Optional, Set, Tuple, Union
 
 from pydependence._core.builtin import BUILTIN_MODULE_NAMES
 from pydependence._core.module_imports_ast import (
@@ -62,6 +62,21 @@ class ImportMatcherBase(abc.ABC):
     def cfg_str(self) -> str:
         raise NotImplementedError
 
+    def root_names(self) -> "Optional[Set[str]]":
+        """
+        Get the root names of all the imports that could be matched, this allows
+        matchers to be skipped. Returns None if any root could be matched.
+        """
+        return None
+
+    def matches_whole_roots(self) -> bool:
+        """
+        Check if the result of `match` only depends on the root of the import, i.e.
+        all submodules of a root are matched the same. This allows results to be
+        shared between imports with the same root.
+        """
+        return False
+
 
 class ImportMatcherScope(ImportMatcherBase):
 
@@ -103,43 +118,63 @@ class ImportMatcherGlob(ImportMatcherBase):
             self._parts = (*parts, last)
             self._wildcard = False
         self._base = ".".join(self._parts)
+        self._prefix = self._base + "."
 
     def match(self, import_: str) -> bool:
-        if not self._wildcard:
-            return import_ == self._base
-        else:
-            parts = import_.split(".")
-            return self._parts == parts[: len(self._parts)]
+        if import_ == self._base:
+            return True
+        # submodules of the base, without splitting the import into parts
+        return self._wildcard and import_.startswith(self._prefix)
 
     def cfg_str(self) -> str:
         return f"import={repr(self._orig)}"
 
+    def root_names(self) -> "Set[str]":
+        return {self._parts[0]}
+
+    def matches_whole_roots(self) -> bool:
+        return self._wildcard and len(self._parts) == 1
+
 
 class ImportMatcherGlobs(ImportMatcherBase):
 
     def __init__(self, import_globs: "Union[str, List[str]]"):
         if isinstance(import_globs, str):
             import_globs = import_globs.split(",")
-        self._orig = ",".join(import_globs)
-        # create
+        # create & dedupe in a single pass, keeping the original order
         self._matchers = []
-        # dedupe
         _added = set()
         for x in import_globs:
             if x not in _added:
                 self._matchers.append(ImportMatcherGlob(x))
                 _added.add(x)
+        self._orig = ",".join(m._orig for m in self._matchers)
+        # index the globs, exact globs only match their base, while wildcard globs
+        # also match any import that has their base as a dotted prefix
+        self._exact = frozenset(m._base for m in self._matchers if not m._wildcard)
+        self._wildcard = frozenset(m._base for m in self._matchers if m._wildcard)
 
     def match(self, import_: str) -> bool:
-        # linear search... inefficient...
-        for matcher in self._matchers:
-            if matcher.match(import_):
-                return True
+        if import_ in self._exact or import_ in self._wildcard:
+            return True
+        # check each dotted prefix, O(depth) rather than O(num globs)
+        if self._wildcard:
+            i = import_.find(".")
+            while i != -1:
+                if import_[:i] in self._wildcard:
+                    return True
+                i = import_.find(".", i + 1)
         return False
 
     def cfg_str(self) -> str:
         return f"import={repr(self._orig)}"
 
+    def root_names(self) -> "Set[str]":
+        return set().union(*(matcher.root_names() for matcher in self._matchers))
+
+    def matches_whole_roots(self) -> bool:
+        return all(matcher.matches_whole_roots() for matcher in self._matchers)
+
 
 # ========================================================================= #
 # REQUIREMENTS MAPPER (INFO)                                                #
@@ -160,26 +195,35 @@ class MappedRequirementInfo(NamedTuple):
 
 @dataclasses.dataclass
 class MappedRequirementSource:
+    # one per requirement & source, declared manually for python<3.10 support
+    __slots__ = ("source_module", "source_module_imports")
+
     source_module: str
     source_module_imports: List[BasicImportInfo]
 
     def to_output_requirement_source(self):
+        # aggregate in a single pass over the imports
+        is_lazy, is_manual = True, False
+        for imp in self.source_module_imports:
+            is_lazy = is_lazy and imp.is_lazy
+            is_manual = is_manual or isinstance(imp, ManualImportInfo)
         return OutMappedRequirementSource(
             source_module=self.source_module,
-            is_lazy=all(imp.is_lazy for imp in self.source_module_imports),
-            is_manual=any(
-                isinstance(imp, ManualImportInfo) for imp in self.source_module_imports
-            ),
+            is_lazy=is_lazy,
+            is_manual=is_manual,
         )
 
 
 @dataclasses.dataclass
 class MappedRequirement:
+    __slots__ = ("requirement", "sources")
+
     requirement: str  # mapped name
     sources: Dict[str, MappedRequirementSource]  # k == v.source_module
 
     def get_sorted_sources(self) -> List[MappedRequirementSource]:
-        return sorted(self.sources.values(), key=lambda x: x.source_module)
+        # keys are the source modules, sort these directly instead of via the values
+        return [self.sources[k] for k in sorted(self.sources)]
 
     def to_output_requirement(self):
         return OutMappedRequirement(
@@ -197,10 +241,7 @@ class MappedRequirements:
     resolver_name: Optional[str] = None
 
     def get_sorted_requirements(self) -> List[MappedRequirement]:
-        return sorted(
-            self.requirements.values(),
-            key=lambda x: x.requirement,
-        )
+        return [self.requirements[k] for k in sorted(self.requirements)]
 
     def to_output_requirements(self):
         return OutMappedRequirements(
@@ -233,6 +274,54 @@ class ReqMatcher:
     def cfg_str(self) -> str:
         return f"{{requirement={repr(self.requirement)}, {self.matcher.cfg_str()}}}"
 
+    def match_requirement(self, import_: str) -> "Optional[str]":
+        if self.matcher.match(import_):
+            return self.requirement
+        return None
+
+
+class _ReqMatchersIndex:
+    """
+    Matchers grouped by the root names of the imports that they can match, so that
+    only the relevant matchers are tested, while still keeping the original order.
+    """
+
+    def __init__(self, req_matchers: "List[ReqMatcher]"):
+        roots = [rm.matcher.root_names() for rm in req_matchers]
+        self._by_root: "Dict[str, Tuple[ReqMatcher, ...]]" = {
+            root: tuple(
+                rm for rm, r in zip(req_matchers, roots) if r is None or root in r
+            )
+            for root in set().union(*(r for r in roots if r is not None))
+        }
+        # matchers that could match any root
+        self._any_root: "Tuple[ReqMatcher, ...]" = tuple(
+            rm for rm, r in zip(req_matchers, roots) if r is None
+        )
+        # if no matcher looks past the root, e.g. `numpy.*`, then all imports with
+        # the same root map to the same requirement and only need to be matched once.
+        self._root_only = all(rm.matcher.matches_whole_roots() for rm in req_matchers)
+        self._root_cache: "Dict[str, Optional[str]]" = {}
+
+    def match_requirement(self, import_: str) -> "Optional[str]":
+        root = import_.partition(".")[0]
+        if not self._root_only:
+            return self._match_requirement(root, import_)
+        try:
+            return self._root_cache[root]
+        except KeyError:
+            requirement = self._root_cache[root] = self._match_requirement(
+                root, import_
+            )
+            return requirement
+
+    def _match_requirement(self, root: str, import_: str) -> "Optional[str]":
+        for rm in self._by_root.get(root, self._any_root):
+            requirement = rm.match_requirement(import_)
+            if requirement is not None:
+                return requirement
+        return None
+
 
 class RequirementsMapper:
 
@@ -246,6 +335,22 @@ class RequirementsMapper:
         #   we could have multiple imports that match to the same requirement.
         #   we could potentially be stricter about this in future...
         self._env_matchers = self._validate_env_matchers(env_matchers)
+        # * matchers are indexed by import root, so only the few matchers that could
+        #   match are tested. The default env is joined onto the end of every other
+        #   env, so that each lookup only needs to check one index.
+        default_matchers = self._env_matchers.get(DEFAULT_REQUIREMENTS_ENV, [])
+        self._env_matchers_index = {
+            env: _ReqMatchersIndex(
+                matchers
+                if env == DEFAULT_REQUIREMENTS_ENV
+                else matchers + default_matchers
+            )
+            for env, matchers in self._env_matchers.items()
+        }
+        # (import, env, strict) -> mapped requirement info
+        # * unbounded, a mapper is built once per run and the number of unique
+        #   imports is small. Not thread-safe, but mappers are not shared.
+        self._cache: "Dict[Tuple[str, Optional[str], bool], MappedRequirementInfo]" = {}
 
     @classmethod
     def _validate_env_matchers(cls, env_matchers) -> "Dict[str, List[ReqMatcher]]":
@@ -302,7 +407,6 @@ class RequirementsMapper:
         )
         return req_info.requirement
 
-    @functools.lru_cache(maxsize=256)
     def map_import_to_requirement_info(
         self,
         import_: str,
@@ -313,37 +417,53 @@ class RequirementsMapper:
         """
         :raises NoConfiguredRequirementMappingError: if no requirement is found for an import and if strict mode is enabled.
         """
+        key = (import_, requirements_env, strict)
+        try:
+            return self._cache[key]
+        except KeyError:
+            pass
+        # errors are not cached, these are raised again on the next call
+        req_info = self._map_import_to_requirement_info(
+            import_,
+            requirements_env=requirements_env,
+            strict=strict,
+        )
+        self._cache[key] = req_info
+        return req_info
+
+    def _map_import_to_requirement_info(
+        self,
+        import_: str,
+        *,
+        requirements_env: "Optional[str]",
+        strict: bool,
+    ) -> "MappedRequirementInfo":
         if requirements_env is None:
             requirements_env = DEFAULT_REQUIREMENTS_ENV
-        # 1. take the specific env
-        if requirements_env != DEFAULT_REQUIREMENTS_ENV:
-            if requirements_env not in self._env_matchers:
+        # 1. take the specific env, followed by the default env
+        index = self._env_matchers_index.get(requirements_env, None)
+        if index is None:
+            if requirements_env != DEFAULT_REQUIREMENTS_ENV:
                 raise ValueError(
                     f"env: {repr(requirements_env)} has not been defined for a requirement."
                 )
-            for rm in self._env_matchers[requirements_env]:
-                if rm.matcher.match(import_):
-                    return MappedRequirementInfo(
-                        rm.requirement,
-                        is_mapped=True,
-                        original_name=import_,
-                    )
-        # 2. take the default env
-        for rm in self._env_matchers.get(DEFAULT_REQUIREMENTS_ENV, []):
-            if rm.matcher.match(import_):
+        else:
+            requirement = index.match_requirement(import_)
+            if requirement is not None:
                 return MappedRequirementInfo(
-                    rm.requirement,
+                    requirement,
                     is_mapped=True,
                     original_name=import_,
                 )
-        # 3. return the root
+        # 2. return the root
         if strict:
             raise NoConfiguredRequirementMappingError(
                 msg=f"could not find import to requirement mappings: {repr(import_)},\ndefine a scope or glob matcher for this import, or set disable strict mode!",
                 imports={import_},
             )
         else:
-            root = import_.split(".")[0]
+            # interned like targets & module names, these become requirement keys
+            root = sys.intern(import_.partition(".")[0])
             warnings.warn(
                 f"could not find a matching requirement for import: {repr(import_)}, returning the import root: {repr(root)} as the requirement"
             )
@@ -395,61 +515,67 @@ class RequirementsMapper:
             resolver_name=resolver_name,
         )
         errors = []
+        requirements = r.requirements
         for imp in imports:
             # 1. map requirements
-            if imp.target in BUILTIN_MODULE_NAMES:  # TODO: needed?
-                req_info = MappedRequirementInfo(
-                    imp.target,
-                    is_mapped=False,
-                    original_name=imp.target,
-                )
-            elif imp.root_target in BUILTIN_MODULE_NAMES:
+            target = imp.target
+            if target in BUILTIN_MODULE_NAMES:  # TODO: needed?
                 req_info = MappedRequirementInfo(
-                    imp.root_target,
+                    target,
                     is_mapped=False,
-                    original_name=imp.target,  # TODO: or should this be root?
+                    original_name=target,
                 )
             else:
-                try:
-                    req_info = self.map_import_to_requirement_info(
-                        imp.target,
-                        requirements_env=requirements_env,
-                        strict=strict,
+                root_target = target.partition(".")[0]
+                if root_target in BUILTIN_MODULE_NAMES:
+                    req_info = MappedRequirementInfo(
+                        sys.intern(root_target),
+                        is_mapped=False,
+                        original_name=target,  # TODO: or should this be root?
                     )
-                except NoConfiguredRequirementMappingError as e:
-                    errors.append(e)
-                    continue
+                else:
+                    try:
+                        req_info = self.map_import_to_requirement_info(
+                            target,
+                            requirements_env=requirements_env,
+                            strict=strict,
+                        )
+                    except NoConfiguredRequirementMappingError as e:
+                        errors.append(e)
+                        continue
 
             # 2. get or create requirement sources
-            req_group = r.requirements.get(req_info.requirement, None)
+            requirement = req_info.requirement
+            req_group = requirements.get(requirement, None)
             if req_group is None:
                 req_group = MappedRequirement(
-                    requirement=req_info.requirement,
+                    requirement=requirement,
                     sources={},
                 )
-                r.requirements[req_info.requirement] = req_group
+                requirements[requirement] = req_group
 
             # - get or create requirement source import
-            req_group_source = req_group.sources.get(imp.source_name, None)
+            source_name = imp.source_name
+            req_group_source = req_group.sources.get(source_name, None)
             if req_group_source is None:
                 req_group_source = MappedRequirementSource(
-                    source_module=imp.source_name,
+                    source_module=source_name,
                     source_module_imports=[],
                 )
-                req_group.sources[imp.source_name] = req_group_source
+                req_group.sources[source_name] = req_group_source
 
             # - append import to source & update
             req_group_source.source_module_imports.append(imp)
 
         if errors:
             err_imports = {imp for e in errors for imp in e.imports}
-            err_roots = {imp.split(".")[0] for imp in err_imports}
+            err_roots = {imp.partition(".")[0] for imp in err_imports}
             raise NoConfiguredRequirementMappingError(
                 msg=(
                     f"could not find import to requirement mappings for roots:"
-                    f"\n  * {', '.join(map(repr, map(str, sorted(set(err_roots)))))},"
+                    f"\n  * {', '.join(map(repr, map(str, sorted(err_roots))))},"
                     f"\nor full imports:"
-                    f"\n  * {', '.join(map(repr, map(str, sorted(set(err_imports)))))},"
+                    f"\n  * {', '.join(map(repr, map(str, sorted(err_imports))))},"
                     f"\navailable matchers: {self._get_matcher_cfg_sting(requirements_env=requirements_env) or '<NONE>'},"
                     f"\notherwise if running from a config file, set strict_requirements_map=False to disable strict mode and use the root module name instead."
                 ),
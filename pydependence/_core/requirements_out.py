@@ -24,7 +24,6 @@
 
 
 import dataclasses
-from collections import defaultdict
 from typing import List, NamedTuple, Optional, Tuple
 
 # ========================================================================= #
@@ -34,13 +33,16 @@ from typing import List, NamedTuple, Optional, Tuple
 
 @dataclasses.dataclass
 class OutMappedRequirementSource:
+    # one per requirement & source, declared manually for python<3.10 support
+    __slots__ = ("source_module", "is_lazy", "is_manual")
+
     source_module: str
     is_lazy: bool
     is_manual: bool
 
     @property
     def source_module_root(self):
-        return self.source_module.split(".")[0]
+        return self.source_module.partition(".")[0]
 
 
 class SrcInfo(NamedTuple):
@@ -57,6 +59,8 @@ class SrcInfo(NamedTuple):
 
 @dataclasses.dataclass
 class OutMappedRequirement:
+    __slots__ = ("requirement", "sources")
+
     requirement: str
     sources: List[OutMappedRequirementSource]
 
@@ -76,12 +80,13 @@ class OutMappedRequirement:
     ) -> "List[SrcInfo]":
         if enabled:
             if roots:
-                r = defaultdict(lambda: True)
+                r = {}
                 for src in self.sources:
-                    r[src.source_module_root] &= src.is_lazy
+                    root = src.source_module_root
+                    r[root] = r.get(root, True) and src.is_lazy
                 return [
-                    SrcInfo(name=k, comment="[L]" if annotate and r[k] else "")
-                    for k in sorted(r.keys())
+                    SrcInfo(name=k, comment="[L]" if annotate and lazy else "")
+                    for k, lazy in sorted(r.items())
                 ]
             else:
                 return [
@@ -158,20 +163,20 @@ class OutMappedRequirements:
         lines = []
         if notice:
             lines.append(f"# {self.autogen_notice}")
+        indent = " " * indent_size
         for req in self.requirements:
-            # add requirement
-            lines.append(f"{req.requirement}")
-            # add annotations
-            lines[
-                -1
-            ] += f"{req.get_annotations_string(enabled=sources_annotations, comment=True)}"
+            # add requirement & annotations
+            line = f"{req.requirement}{req.get_annotations_string(enabled=sources_annotations, comment=True)}"
             # add compact sources
-            if sources:
-                if sources_compact:
-                    lines[-1] += f" # {req.get_sources_string(roots=sources_roots)}"
-                else:
-                    for src_info in req.get_source_info(roots=sources_roots):
-                        lines.append(f"{' '*indent_size*1}# {src_info.anno_str}")
+            if sources and sources_compact:
+                line = f"{line} # {req.get_sources_string(roots=sources_roots)}"
+            lines.append(line)
+            # add sources
+            if sources and not sources_compact:
+                lines.extend(
+                    f"{indent}# {src_info.anno_str}"
+                    for src_info in req.get_source_info(roots=sources_roots)
+                )
         if self.requirements or notice:
             lines.append("")
         return "\n".join(lines)
@@ -186,55 +191,42 @@ class OutMappedRequirements:
         indent_size: int = 4,
     ):
         import tomlkit
-        import tomlkit.container
         import tomlkit.items
 
-        # create table
-        array = tomlkit.array().multiline(True)
+        # empty table
+        if not (self.requirements or notice):
+            return tomlkit.array().multiline(True)
+        # Build the array as a string and parse it once. `Array.add_line` is slow,
+        # each call re-processes all the existing lines, which is quadratic for large
+        # arrays. Comments are formatted the same as `add_line` would, i.e. `# ...`
+        indent = " " * (indent_size * 1)
+        lines = ["array = ["]
         if notice:
-            array.add_line(
-                indent=" " * (indent_size * 1),
-                comment=self.autogen_notice,
-            )
+            lines.append(f"{indent}# {self.autogen_notice}")
         for req in self.requirements:
-            comment = ""
-            comment += req.get_annotations_string(
+            comment = req.get_annotations_string(
                 enabled=sources_annotations,
                 comment=False,
             )
-            comment += req.get_sources_string(
-                enabled=sources and sources_compact,
-                roots=sources_roots,
-            )
+            # - compact and extended sources are exclusive, only one is generated
+            if sources and sources_compact:
+                comment += req.get_sources_string(roots=sources_roots)
             # add requirement & compact sources
-            array.add_line(
-                req.requirement,
-                indent=" " * (indent_size * 1),
-                comment=comment,
-            )
+            line = f"{indent}{tomlkit.string(req.requirement).as_string()},"
+            if comment:
+                line = f"{line} # {comment}"
+            lines.append(line)
             # add extended sources
-            for src_info in req.get_source_info(
-                enabled=sources and not sources_compact,
-                roots=sources_roots,
-            ):
-                # Add line has a bug where it doesn't add the correct indentation before the comment
-                # - so we instead add padding after the `#`
-                # `array.add_line(indent=f"{' ' * (indent_size * 1)}, comment=f"{src_info.anno_str}")`
-                array.add_line(
-                    indent="", comment=f"{' ' * (indent_size * 1)}{src_info.anno_str}"
+            if sources and not sources_compact:
+                lines.extend(
+                    f"# {indent}{src_info.anno_str}"
+                    for src_info in req.get_source_info(roots=sources_roots)
                 )
-                # NOTE: While this does not properly handle commas between lines ...
-                # array.append(tomlkit.items.Comment(tomlkit.container.Trivia(
-                #     indent=" " * (indent_size * 1),
-                #     comment_ws="",
-                #     comment=f"# {src_info.anno_str}\n",
-                #     trail="",
-                # )))
-
-        if self.requirements or notice:
-            array.add_line(indent="")
-        # done!
-        return array
+        lines.append("]\n")
+        # parse, the array is re-rendered with consistent indents when multiline
+        array = tomlkit.parse("\n".join(lines))["array"]
+        assert isinstance(array, tomlkit.items.Array)
+        return array.multiline(True)
 
 
 # ========================================================================= #
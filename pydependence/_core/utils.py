@@ -22,8 +22,9 @@
 # SOFTWARE.                                                                      #
 # ============================================================================== #
 
+import sys
 from pathlib import Path
-from typing import List, Union
+from typing import Any, Dict, List, Tuple, Union
 
 # ========================================================================= #
 # AST IMPORT PARSER                                                         #
@@ -105,6 +106,26 @@ def load_toml_document(
     return toml
 
 
+def load_toml_dict(
+    path: "Union[str, Path]",
+) -> "Dict[str, Any]":
+    """
+    Read-only alternative to `load_toml_document`. Style information is not needed
+    when loading configs, so rather use the faster builtin `tomllib` if available
+    instead of round-tripping through `tomlkit`.
+    """
+    path = Path(path)
+    if not path.is_file():
+        raise FileNotFoundError(f"path is not a file: {path}")
+    if sys.version_info >= (3, 11):
+        import tomllib
+
+        with open(path, "rb") as fp:
+            return tomllib.load(fp)
+    else:
+        return load_toml_document(path).unwrap()
+
+
 # ========================================================================= #
 # WRITE                                                                     #
 # ========================================================================= #
@@ -128,37 +149,46 @@ def toml_file_replace_array(
     keys: "List[str]",
     array: "tomlkit.items.Array",
 ):
+    toml_file_replace_arrays(file=file, arrays=[(keys, array)])
+
+
+def toml_file_replace_arrays(
+    *,
+    file: "Union[str, Path]",
+    arrays: "List[Tuple[List[str], tomlkit.items.Array]]",
+):
+    """
+    Replace multiple arrays in the toml file, the file is only loaded and written once.
+    """
     import tomlkit
     import tomlkit.items
     import tomlkit.toml_document
 
-    # TODO: this needs multiple loads and writes if we are modifying multiple arrays
-    #       which is not ideal... but it is a simple solution for now.
-
-    assert isinstance(
-        array, tomlkit.items.Array
-    ), f"array must be a tomlkit Array, got: {type(array)}"
-
     # load file
     file = Path(file)
     assert file.is_absolute(), f"file must be an absolute path, got: {file}"
     toml = load_toml_document(file)
 
-    # split parent keys from array key
-    (*parent_keys, array_key) = keys
+    for keys, array in arrays:
+        assert isinstance(
+            array, tomlkit.items.Array
+        ), f"array must be a tomlkit Array, got: {type(array)}"
+
+        # split parent keys from array key
+        (*parent_keys, array_key) = keys
 
-    # add parent sections if missing
-    parent = toml
-    for i, k in enumerate(parent_keys):
-        section = parent.setdefault(k, {})
-        assert isinstance(section, tomlkit.items.Table)
-        parent = section
+        # add parent sections if missing
+        parent = toml
+        for i, k in enumerate(parent_keys):
+            section = parent.setdefault(k, {})
+            assert isinstance(section, tomlkit.items.Table)
+            parent = section
 
-    # set array
-    if array_key in parent:
-        old_array = parent[array_key]
-        assert isinstance(old_array, tomlkit.items.Array)
-    parent[array_key] = array
+        # set array
+        if array_key in parent:
+            old_array = parent[array_key]
+            assert isinstance(old_array, tomlkit.items.Array)
+        parent[array_key] = array
 
     # write
     with open(file, "w") as fp:
@@ -175,4 +205,5 @@ __all__ = (
     "assert_valid_import_name",
     "apply_root_to_path_str",
     "load_toml_document",
+    "load_toml_dict",
 )
@@ -0,0 +1,45 @@
+# ============================================================================== #
+# MIT License                                                                    #
+#                                                                                #
+# Copyright (c) 2024 Nathan Juraj Michlo                                         #
+#                                                                                #
+# Permission is hereby granted, free of charge, to any person obtaining a copy   #
+# of this software and associated documentation files (the "Software"), to deal  #
+# in the Software without restriction, including without limitation the rights   #
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell      #
+# copies of the Software, and to permit persons to whom the Software is          #
+# furnished to do so, subject to the following conditions:                       #
+#                                                                                #
+# The above copyright notice and this permission notice shall be included in all #
+# copies or substantial portions of the Software.                                #
+#                                                                                #
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR     #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,       #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE    #
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER         #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,  #
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE  #
+# SOFTWARE.                                                                      #
+# ============================================================================== #
+
+import pytest
+
+from pydependence._core.module_imports_loader import DEFAULT_MODULE_IMPORTS_LOADER
+
+# ========================================================================= #
+# FIXTURES                                                                  #
+# ========================================================================= #
+
+
+@pytest.fixture(autouse=True)
+def _disable_disk_cache(monkeypatch):
+    # never write to the user's real cache dir, tests that need the disk cache
+    # should construct their own loader pointing to `tmp_path`
+    monkeypatch.setattr(DEFAULT_MODULE_IMPORTS_LOADER, "_cache_dir", None)
+    # - also disabled for subprocesses, e.g. when running the cli
+    monkeypatch.setenv("PYDEPENDENCE_CACHE_DIR", "")
+
+
+# ========================================================================= #
+# END                                                                       #
+# ========================================================================= #
@@ -33,11 +33,13 @@ from pydependence._core.module_imports_ast import (
     ImportSourceEnum,
     LocImportInfo,
     ManualImportInfo,
+    _AstImportsCollector,
     load_imports_from_module_info,
 )
 from pydependence._core.module_imports_loader import (
     DEFAULT_MODULE_IMPORTS_LOADER,
     ModuleImports,
+    _ModuleImportsLoader,
 )
 from pydependence._core.modules_resolver import (
     ScopeNotASubsetError,
@@ -48,6 +50,8 @@ from pydependence._core.modules_scope import (
     DuplicateModulePathsError,
     DuplicateModulesError,
     ModulesScope,
+    RestrictMode,
+    RestrictOp,
     UnreachableModeEnum,
     UnreachableModuleError,
     _find_modules,
@@ -56,6 +60,7 @@ from pydependence._core.requirements_map import (
     DEFAULT_REQUIREMENTS_ENV,
     ImportMatcherBase,
     ImportMatcherGlob,
+    ImportMatcherGlobs,
     ImportMatcherScope,
     NoConfiguredRequirementMappingError,
     ReqMatcher,
@@ -226,6 +231,147 @@ def test_get_module_imports(module_info):
     assert results_2 is results_3
 
 
+def test_get_module_imports_statements_only():
+    import ast
+
+    # modules without lazy import callables can skip visiting expressions
+    for path in [PKG_A / "a2.py", PKG_B / "b2.py", PKG_D]:
+        info = ModuleMetadata.from_root_and_subpath(PKGS_ROOT, subpath=path, tag="test")
+        results = []
+        for statements_only in [False, True]:
+            collector = _AstImportsCollector(info, statements_only=statements_only)
+            collector.visit(ast.parse(path.read_text()))
+            results.append(dict(collector._imports))
+        assert results[0] == results[1]
+        assert results[0] == load_imports_from_module_info(info)
+
+
+def test_get_module_imports_no_imports(tmp_path):
+    # files without any imports are not visited
+    path = tmp_path / "no_imports.py"
+    path.write_text("def foo():\n    return 'no imports'\n")
+    info = ModuleMetadata.from_root_and_subpath(tmp_path, subpath=path, tag="test")
+    assert load_imports_from_module_info(info) == {}
+    # but are still parsed, so syntax errors are raised
+    path.write_text("def foo(:\n    return 'not valid python'\n")
+    with pytest.raises(SyntaxError):
+        load_imports_from_module_info(info)
+    # files with imports are visited
+    path.write_text("def foo():\n    import os\n")
+    assert list(load_imports_from_module_info(info)) == ["os"]
+
+
+def test_module_imports_loader_preload():
+    scope = ModulesScope().add_modules_from_search_path(
+        PKGS_ROOT, unreachable_mode=UnreachableModeEnum.keep
+    )
+    module_infos = [d.module_info for _, d in scope.iter_module_items()]
+    # parallel
+    loader = _ModuleImportsLoader()
+    loader.preload(module_infos, max_workers=2, min_parallel=0)
+    assert set(loader._modules_imports) == set(module_infos)
+    for info in module_infos:
+        v = loader.load_module_imports(info)
+        assert v is loader._modules_imports[info]
+        assert v.module_imports == load_imports_from_module_info(info)
+    # serial
+    loader = _ModuleImportsLoader()
+    loader.preload(module_infos)
+    assert set(loader._modules_imports) == set(module_infos)
+
+
+def test_get_module_imports_disk_cache(module_info, tmp_path, monkeypatch):
+    import pydependence._core.module_imports_loader as loader_module
+
+    expected = load_imports_from_module_info(module_info)
+
+    # 1. miss, populates the cache
+    loader = _ModuleImportsLoader(cache_dir=tmp_path)
+    results = loader.load_module_imports(module_info)
+    assert results.module_imports == expected
+    assert len(list(tmp_path.glob("*/*.pkl"))) == 1
+
+    # 2. hit, should not need to parse the file again
+    def _raise(*args, **kwargs):
+        raise AssertionError("should not parse the file on a cache hit")
+
+    monkeypatch.setattr(loader_module, "load_imports_from_module_info", _raise)
+    loader = _ModuleImportsLoader(cache_dir=tmp_path)
+    results = loader.load_module_imports(module_info)
+    assert results.module_imports == expected
+    assert results.module_info is module_info
+    # - targets are re-interned after unpickling
+    for target, imports in results.module_imports.items():
+        assert target is sys.intern(target)
+        assert all(i.target is target for i in imports)
+
+    # 3. different metadata for the same file is a miss
+    other_info = module_info._replace(tag="other")
+    with pytest.raises(AssertionError, match="should not parse the file"):
+        loader.load_module_imports(other_info)
+
+
+def test_get_module_imports_disk_cache_overwrites_stale(tmp_path):
+    path = tmp_path / "mod.py"
+    path.write_text("import os\n")
+    info = ModuleMetadata.from_root_and_subpath(tmp_path, subpath=path, tag="test")
+    # 1. populate
+    loader = _ModuleImportsLoader(cache_dir=tmp_path / "cache")
+    assert list(loader.load_module_imports(info).module_imports) == ["os"]
+    # 2. modify the file, the entry is stale and replaced, not added
+    path.write_text("import sys\nimport json\n")
+    loader = _ModuleImportsLoader(cache_dir=tmp_path / "cache")
+    assert list(loader.load_module_imports(info).module_imports) == ["sys", "json"]
+    assert len(list((tmp_path / "cache").glob("*/*.pkl"))) == 1
+    # 3. the replaced entry is a hit
+    loader = _ModuleImportsLoader(cache_dir=tmp_path / "cache")
+    assert list(loader.load_module_imports(info).module_imports) == ["sys", "json"]
+
+
+def test_module_imports_loader_warnings(tmp_path, monkeypatch):
+    import pydependence._core.module_imports_loader as loader_module
+
+    infos = []
+    for name in ["mod1", "mod2"]:
+        path = tmp_path / f"{name}.py"
+        path.write_text("lazy_import(1)\n")
+        infos.append(
+            ModuleMetadata.from_root_and_subpath(tmp_path, subpath=path, tag="test")
+        )
+    match = "called with non-string argument"
+
+    # 1. parsed, warnings are replayed
+    loader = _ModuleImportsLoader(cache_dir=tmp_path / "cache")
+    with pytest.warns(SyntaxWarning, match=match):
+        loader.load_module_imports(infos[0])
+    # 2. parsed in worker processes, warnings are replayed in this process
+    with pytest.warns(SyntaxWarning, match=match) as record:
+        _ModuleImportsLoader().preload(infos, max_workers=2, min_parallel=0)
+    assert sorted(w.filename for w in record) == sorted(str(i.path) for i in infos)
+    # 3. loaded from the disk cache, warnings are still replayed
+    monkeypatch.setattr(loader_module, "load_imports_from_module_info", None)
+    loader = _ModuleImportsLoader(cache_dir=tmp_path / "cache")
+    with pytest.warns(SyntaxWarning, match=match):
+        loader.load_module_imports(infos[0])
+
+
+def test_get_default_cache_dir(tmp_path, monkeypatch):
+    from pydependence._core.module_imports_loader import (
+        _DISK_CACHE_VERSION,
+        _get_default_cache_dir,
+    )
+
+    monkeypatch.delenv("PYDEPENDENCE_CACHE_DIR", raising=False)
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    assert _get_default_cache_dir() == tmp_path / "pydependence" / _DISK_CACHE_VERSION
+    # override
+    monkeypatch.setenv("PYDEPENDENCE_CACHE_DIR", str(tmp_path / "other"))
+    assert _get_default_cache_dir() == tmp_path / "other" / _DISK_CACHE_VERSION
+    # disabled
+    monkeypatch.setenv("PYDEPENDENCE_CACHE_DIR", "")
+    assert _get_default_cache_dir() is None
+
+
 # ========================================================================= #
 # TESTS - FIND MODULES                                                      #
 # ========================================================================= #
@@ -513,6 +659,23 @@ def test_modules_scope():
     assert set(restrict_scope_a.iter_modules()) == modules_a
     restrict_scope_aa = scope_all.get_restricted_scope(imports=["A.a3"])
     assert set(restrict_scope_aa.iter_modules()) == {"A.a3", "A.a3.a3i"}
+    restrict_scope_root = scope_all.get_restricted_scope(
+        imports=["A.a3"], mode=RestrictMode.ROOT_CHILDREN
+    )
+    assert set(restrict_scope_root.iter_modules()) == modules_a
+
+    # restrict multiple, same as chaining
+    restrict_scope_multi = scope_all.get_restricted_scope_multi(
+        [
+            (RestrictOp.LIMIT, ["A"], RestrictMode.CHILDREN),
+            (RestrictOp.EXCLUDE, ["A.a3"], RestrictMode.CHILDREN),
+        ]
+    )
+    restrict_scope_chain = restrict_scope_a.get_restricted_scope(
+        imports=["A.a3"], op=RestrictOp.EXCLUDE
+    )
+    assert restrict_scope_multi.is_scope_equal(restrict_scope_chain)
+    assert set(restrict_scope_multi.iter_modules()) == modules_a - {"A.a3", "A.a3.a3i"}
 
 
 def test_error_instance_of():
@@ -544,6 +707,20 @@ def test_resolve_scope():
         "buzz": {"t_ast_parser": 1},
     }
 
+    # imports are cached on the scope, until modules are added
+    adjacency = scope_ast._get_import_adjacency(visit_lazy=True)
+    assert scope_ast._get_import_adjacency(visit_lazy=True) is adjacency
+    assert scope_ast._get_import_adjacency(visit_lazy=False) is not adjacency
+    scope_ast.add_modules_from_package_path(
+        PKG_A, unreachable_mode=UnreachableModeEnum.keep
+    )
+    assert scope_ast._get_import_adjacency(visit_lazy=True) is not adjacency
+
+    # reverse lookup
+    assert scope_ast.get_module_importers("sys") == ["t_ast_parser"]
+    assert scope_ast.get_module_importers("A.a2") == ["A.a1"]
+    assert scope_ast.get_module_importers("A.a1") == []
+
 
 def test_resolve_across_scopes():
     scope_all = ModulesScope()
@@ -836,6 +1013,28 @@ def test_import_matchers():
     assert matcher_glob.match("A.a1")
     assert matcher_glob.match("A.a1.asdf")
 
+    # GLOBS, exact and nested wildcards
+    matcher_globs = ImportMatcherGlobs("B,A.a1.*")
+    assert matcher_globs.match("B")
+    assert not matcher_globs.match("B.b1")
+    assert not matcher_globs.match("A")
+    assert matcher_globs.match("A.a1")
+    assert matcher_globs.match("A.a1.asdf")
+    assert not matcher_globs.match("A.a1x")
+
+    # ROOTS, used to skip matchers
+    assert matcher_scope.root_names() is None
+    assert ImportMatcherGlob("A.a1.*").root_names() == {"A"}
+    assert ImportMatcherGlobs("A.a1.*,B,A").root_names() == {"A", "B"}
+
+    # WHOLE ROOTS, used to share results between imports with the same root
+    assert not matcher_scope.matches_whole_roots()
+    assert ImportMatcherGlob("A.*").matches_whole_roots()
+    assert not ImportMatcherGlob("A").matches_whole_roots()
+    assert not ImportMatcherGlob("A.a1.*").matches_whole_roots()
+    assert ImportMatcherGlobs("A.*,B.*").matches_whole_roots()
+    assert not ImportMatcherGlobs("A.*,B").matches_whole_roots()
+
     # INVALID
     with pytest.raises(ValueError):
         ImportMatcherGlob("A.*.*")
@@ -33,6 +33,8 @@ from pydependence._core.utils import (
     assert_valid_import_name,
     assert_valid_module_path,
     assert_valid_tag,
+    load_toml_dict,
+    load_toml_document,
 )
 
 
@@ -95,3 +97,10 @@ def test_apply_root_to_path_str():
     with pytest.raises(ValueError):
         apply_root_to_path_str("relative/path", "another/relative/path")
     assert apply_root_to_path_str(root, str(Path.home())) == str(Path.home().resolve())
+
+
+def test_load_toml_dict():
+    path = Path(__file__).parent / "test-packages" / "pyproject.toml"
+    assert load_toml_dict(path) == load_toml_document(path).unwrap()
+    with pytest.raises(FileNotFoundError):
+        load_toml_dict("/path/does/not/exist.toml")